@@ -86,78 +86,82 @@ def report(csv_file, out_dir, title, max_hist_columns, top_k_categories,
         
         
         report_path = Path(out_dir) / "report.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {title}\n\n")
-            f.write(f"## Dataset Statistics\n")
-            f.write(f"- Rows: {stats['rows']}\n")
-            f.write(f"- Columns: {stats['columns']}\n\n")
-            
-            f.write(f"## Data Quality Assessment\n")
-            f.write(f"- Overall quality check:\n")
-            f.write(f"  - Has missing values: {quality.get('has_missing', False)}\n")
-            f.write(f"  - Missing count: {quality.get('missing_count', 0)}\n")
-            f.write(f"  - Has duplicates: {quality.get('has_duplicates', False)}\n")
-            f.write(f"  - Duplicate count: {quality.get('duplicate_count', 0)}\n\n")
-            
-            f.write(f"## Quality Heuristics (HW03)\n")
-            
-           
-            if quality.get('has_constant_columns', False):
-                f.write(f"- **Constant columns detected**: {', '.join(quality.get('constant_columns', []))}\n")
-            else:
-                f.write(f"- ✓ No constant columns found\n")
-            
-            if quality.get('has_high_cardinality', False):
-                f.write(f"- **High cardinality columns** (> {high_cardinality_threshold} unique values): {', '.join(quality.get('high_cardinality_cols', []))}\n")
-            else:
-                f.write(f"- ✓ No high cardinality categorical columns\n")
-            
-           
-            if quality.get('has_id_duplicates', False):
-                f.write(f"- **ID duplicates found**:\n")
-                for col, info in quality.get('duplicate_id_info', {}).items():
-                    f.write(f"  - {col}: {info.get('duplicate_count', 0)} duplicates\n")
-            
-           
-            if quality.get('has_many_zeros', False):
-                f.write(f"- **Many zero values detected** (> {zero_threshold:.0%}):\n")
-                for col_info in quality.get('zero_columns', []):
-                    f.write(f"  - {col_info.get('column', 'unknown')}: {col_info.get('zero_ratio', 0):.1%} zeros\n")
-            
-            
-            f.write(f"\n## Extended Heuristics (HW03 Extension)\n")
-            
-            # Outliers
-            if quality.get('has_outliers', False):
-                f.write(f"- **Outliers detected** (IQR threshold: {outlier_threshold}):\n")
-                for col_info in quality.get('outlier_columns', []):
-                    f.write(f"  - {col_info.get('column', 'unknown')}: ")
-                    f.write(f"{col_info.get('outliers_count', 0)} outliers ")
-                    f.write(f"({col_info.get('outliers_ratio', 0):.1%})\n")
-            else:
-                f.write(f"- ✓ No significant outliers detected\n")
-            
-            # Imbalanced categories
-            if quality.get('has_imbalanced_categories', False):
-                f.write(f"- **Imbalanced categories detected** (threshold: {imbalance_threshold:.0%}):\n")
-                for col_info in quality.get('imbalanced_columns', []):
-                    f.write(f"  - {col_info.get('column', 'unknown')}: ")
-                    f.write(f"'{col_info.get('dominant_category', 'unknown')}' is ")
-                    f.write(f"{col_info.get('dominant_ratio', 0):.1%} of data\n")
-            else:
-                f.write(f"- ✓ Categories are reasonably balanced\n")
-            
-            f.write(f"\n## Report Generation Parameters\n")
-            f.write(f"- Max histograms to generate: {max_hist_columns}\n")
-            f.write(f"- Top categories to show: {top_k_categories}\n")
-            f.write(f"- Missing values threshold: {min_missing_share:.0%}\n")
-            f.write(f"- High cardinality threshold: {high_cardinality_threshold}\n")
-            f.write(f"- Zero values threshold: {zero_threshold:.0%}\n")
-            # Новые параметры
-            f.write(f"- Outlier detection threshold (IQR multiplier): {outlier_threshold}\n")
-            f.write(f"- Imbalance threshold: {imbalance_threshold:.0%}\n")
-            f.write(f"- Report generated with: eda-cli v0.2.0\n")
-        
+        # Отчёт собирается в буфере и пишется на диск одним вызовом,
+        # без построчных f.write с блокировками/флашами
+        buf = []
+        buf.append(f"# {title}\n\n")
+        buf.append(f"## Dataset Statistics\n")
+        buf.append(f"- Rows: {stats['rows']}\n")
+        buf.append(f"- Columns: {stats['columns']}\n\n")
+
+        buf.append(f"## Data Quality Assessment\n")
+        buf.append(f"- Overall quality check:\n")
+        buf.append(f"  - Has missing values: {quality.get('has_missing', False)}\n")
+        buf.append(f"  - Missing count: {quality.get('missing_count', 0)}\n")
+        buf.append(f"  - Has duplicates: {quality.get('has_duplicates', False)}\n")
+        buf.append(f"  - Duplicate count: {quality.get('duplicate_count', 0)}\n\n")
+
+        buf.append(f"## Quality Heuristics (HW03)\n")
+
+
+        if quality.get('has_constant_columns', False):
+            buf.append(f"- **Constant columns detected**: {', '.join(quality.get('constant_columns', []))}\n")
+        else:
+            buf.append(f"- ✓ No constant columns found\n")
+
+        if quality.get('has_high_cardinality', False):
+            buf.append(f"- **High cardinality columns** (> {high_cardinality_threshold} unique values): {', '.join(quality.get('high_cardinality_cols', []))}\n")
+        else:
+            buf.append(f"- ✓ No high cardinality categorical columns\n")
+
+
+        if quality.get('has_id_duplicates', False):
+            buf.append(f"- **ID duplicates found**:\n")
+            for col, info in quality.get('duplicate_id_info', {}).items():
+                buf.append(f"  - {col}: {info.get('duplicate_count', 0)} duplicates\n")
+
+
+        if quality.get('has_many_zeros', False):
+            buf.append(f"- **Many zero values detected** (> {zero_threshold:.0%}):\n")
+            for col_info in quality.get('zero_columns', []):
+                buf.append(f"  - {col_info.get('column', 'unknown')}: {col_info.get('zero_ratio', 0):.1%} zeros\n")
+
+
+        buf.append(f"\n## Extended Heuristics (HW03 Extension)\n")
+
+        # Outliers
+        if quality.get('has_outliers', False):
+            buf.append(f"- **Outliers detected** (IQR threshold: {outlier_threshold}):\n")
+            for col_info in quality.get('outlier_columns', []):
+                buf.append(f"  - {col_info.get('column', 'unknown')}: ")
+                buf.append(f"{col_info.get('outliers_count', 0)} outliers ")
+                buf.append(f"({col_info.get('outliers_ratio', 0):.1%})\n")
+        else:
+            buf.append(f"- ✓ No significant outliers detected\n")
+
+        # Imbalanced categories
+        if quality.get('has_imbalanced_categories', False):
+            buf.append(f"- **Imbalanced categories detected** (threshold: {imbalance_threshold:.0%}):\n")
+            for col_info in quality.get('imbalanced_columns', []):
+                buf.append(f"  - {col_info.get('column', 'unknown')}: ")
+                buf.append(f"'{col_info.get('dominant_category', 'unknown')}' is ")
+                buf.append(f"{col_info.get('dominant_ratio', 0):.1%} of data\n")
+        else:
+            buf.append(f"- ✓ Categories are reasonably balanced\n")
+
+        buf.append(f"\n## Report Generation Parameters\n")
+        buf.append(f"- Max histograms to generate: {max_hist_columns}\n")
+        buf.append(f"- Top categories to show: {top_k_categories}\n")
+        buf.append(f"- Missing values threshold: {min_missing_share:.0%}\n")
+        buf.append(f"- High cardinality threshold: {high_cardinality_threshold}\n")
+        buf.append(f"- Zero values threshold: {zero_threshold:.0%}\n")
+        # Новые параметры
+        buf.append(f"- Outlier detection threshold (IQR multiplier): {outlier_threshold}\n")
+        buf.append(f"- Imbalance threshold: {imbalance_threshold:.0%}\n")
+        buf.append(f"- Report generated with: eda-cli v0.2.0\n")
+
+        report_path.write_text("".join(buf), encoding='utf-8')
+
         click.echo(f"Report generated: {report_path}")
         
     except Exception as e:
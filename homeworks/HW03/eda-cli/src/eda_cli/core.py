@@ -1,13 +1,68 @@
 """Core functions for EDA CLI."""
 
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List
 
 
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load CSV file."""
-    return pd.read_csv(filepath)
+# Ограничение числа feather-sidecar-ов: старейшие вытесняются по mtime
+_SIDECAR_CACHE_MAX = 16
+
+
+def load_data(filepath: str, use_cache: bool = True) -> pd.DataFrame:
+    """Load CSV file, caching the parsed frame in a feather sidecar.
+
+    Повторная загрузка того же файла (типичный сценарий overview -> report)
+    читает колоночный sidecar вместо повторного парсинга CSV. Ключ кэша
+    включает mtime и размер, так что изменённый файл перечитывается заново.
+    Sidecar-ы живут в пользовательском ~/.cache/eda_cli (не в общем
+    tempdir) и вытесняются по mtime, чтобы кэш не рос бесконечно;
+    use_cache=False отключает sidecar для одноразовых файлов.
+    """
+    if use_cache:
+        path = Path(filepath)
+        stat = path.stat()
+        key = hashlib.blake2b(
+            f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode()
+        ).hexdigest()[:16]
+        cache_dir = Path.home() / ".cache" / "eda_cli"
+        cache_path = cache_dir / f"sidecar_{key}.feather"
+        if cache_path.exists():
+            try:
+                return pd.read_feather(cache_path)
+            except Exception:
+                pass  # повреждённый sidecar - перечитываем CSV
+    try:
+        # Многопоточный парсер Arrow; numpy-бэкенд типов сохраняем,
+        # чтобы эвристики по dtype вели себя как раньше
+        df = pd.read_csv(filepath, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(filepath)
+    # Низкокардинальные строковые колонки переводим в category:
+    # дальнейшие nunique/value_counts работают по упакованным кодам,
+    # а не по Python-объектам
+    n_rows = len(df)
+    for col in df.select_dtypes(include="object").columns:
+        if df[col].nunique(dropna=False) / max(n_rows, 1) < 0.5:
+            df[col] = df[col].astype("category")
+    if use_cache:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            df.reset_index(drop=True).to_feather(cache_path)
+            sidecars = sorted(
+                cache_dir.glob("sidecar_*.feather"),
+                key=lambda p: p.stat().st_mtime,
+            )
+            for old in sidecars[:-_SIDECAR_CACHE_MAX]:
+                old.unlink(missing_ok=True)
+        except Exception:
+            pass  # нет pyarrow или несериализуемые колонки - работаем без кэша
+    return df
 
 
 def compute_basic_stats(df: pd.DataFrame) -> Dict[str, Any]:
@@ -15,26 +70,108 @@ def compute_basic_stats(df: pd.DataFrame) -> Dict[str, Any]:
     return {
         "rows": int(len(df)),
         "columns": list(df.columns),
-        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+        # Один векторизованный astype(str) вместо str(dtype) на каждую колонку
+        "dtypes": dict(zip(df.columns, df.dtypes.astype(str)))
+    }
+
+
+def _column_stats(
+    col: str,
+    series: pd.Series,
+    n: int,
+    is_numeric: bool,
+    is_categorical: bool,
+    high_cardinality_threshold: int,
+    min_missing_share: float,
+    imbalance_threshold: float
+) -> Dict[str, Any]:
+    """Независимые от других колонок эвристики для одной колонки.
+
+    Вызывается из пула потоков: редукции numpy/pandas внутри отпускают GIL,
+    поэтому колонки обрабатываются с реальным параллелизмом по ядрам.
+    """
+    arr = series.to_numpy()
+    null_mask = pd.isna(arr)
+    null_count = int(null_mask.sum())
+
+    stats = {
+        "column": col,
+        "null_count": null_count,
+        "missing_flagged": None,
+        "is_constant": False,
+        "high_cardinality": None,
+        "imbalanced": None,
+        "unique_count_with_na": None,
     }
 
+    # Check for missing values
+    missing_ratio = float(null_count / n) if n > 0 else 0.0
+    if missing_ratio > min_missing_share:
+        stats["missing_flagged"] = {
+            "column": col,
+            "missing_ratio": float(missing_ratio),
+            "threshold": float(min_missing_share)
+        }
+
+    if is_numeric:
+        non_null = arr[~null_mask]
+
+        # Check for constant columns
+        if non_null.size > 0 and bool((non_null == non_null[0]).all()):
+            stats["is_constant"] = True
+
+    elif is_categorical:
+        # value_counts считается один раз (без сортировки гистограммы)
+        # и переиспользуется: len(vc) == nunique, max/idxmax == топ-категория
+        value_counts = series.value_counts(sort=False)
+        unique_count = int(len(value_counts))
+        stats["unique_count_with_na"] = unique_count + (1 if null_count > 0 else 0)
+
+        # Check for constant columns
+        if unique_count == 1:
+            stats["is_constant"] = True
 
-def ensure_python_types(obj):
-    """Convert numpy types to standard Python types."""
-    if isinstance(obj, (np.bool_, np.bool)):
-        return bool(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return [ensure_python_types(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {key: ensure_python_types(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [ensure_python_types(item) for item in obj]
+        # Check for high cardinality
+        if unique_count > high_cardinality_threshold:
+            stats["high_cardinality"] = {
+                "column": col,
+                "unique_count": unique_count,
+                "threshold": int(high_cardinality_threshold)
+            }
+
+        # Несбалансированные категории (не проверяем константные колонки)
+        # O(U) max вместо сортировки всей гистограммы O(U log U);
+        # знаменатель = non-null счётчик, уже известный из маски пропусков
+        if unique_count > 1:
+            dominant_ratio = float(value_counts.max() / (n - null_count))
+            if dominant_ratio > imbalance_threshold:
+                dominant_category = value_counts.idxmax()
+                if hasattr(dominant_category, 'item'):
+                    dominant_category = dominant_category.item()
+                stats["imbalanced"] = {
+                    "column": col,
+                    "dominant_category": dominant_category,
+                    "dominant_ratio": float(dominant_ratio),
+                    "threshold": float(imbalance_threshold),
+                    "unique_categories": unique_count
+                }
+
+    else:
+        # Прочие типы (datetime, bool): только проверка на константность
+        if int(series.nunique()) == 1:
+            stats["is_constant"] = True
+
+    # Check for ID duplicates: количество дубликатов = n - nunique,
+    # без отдельного прохода duplicated()
+    if 'id' in col.lower():
+        unique_count_with_na = stats["unique_count_with_na"]
+        if unique_count_with_na is None:
+            unique_count_with_na = int(series.nunique(dropna=False))
+        stats["id_duplicate_count"] = n - unique_count_with_na
     else:
-        return obj
+        stats["id_duplicate_count"] = None
+
+    return stats
 
 
 def compute_quality_flags(
@@ -73,117 +210,125 @@ def compute_quality_flags(
         "duplicate_count": 0,
     }
     
-    # 1. Check for constant columns
-    for col in df.columns:
-        if int(df[col].nunique()) == 1:
+    n = len(df)
+    categorical_dtypes = ['object', 'category', 'string']
+    categorical_cols = set(df.select_dtypes(include=categorical_dtypes).columns)
+    numeric_cols = set(df.select_dtypes(include=[np.number]).columns)
+
+    total_missing = 0
+    col_null_counts = {}
+
+    # Пер-колоночные эвристики независимы и раскладываются по пулу потоков;
+    # executor.map сохраняет порядок колонок, агрегация остаётся
+    # детерминированной
+    tasks = [
+        (col, series, n, col in numeric_cols, col in categorical_cols,
+         high_cardinality_threshold, min_missing_share, imbalance_threshold)
+        for col, series in df.items()
+    ]
+    if len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            col_stats = list(executor.map(lambda args: _column_stats(*args), tasks))
+    else:
+        col_stats = [_column_stats(*args) for args in tasks]
+
+    for stats in col_stats:
+        col = stats["column"]
+        total_missing += stats["null_count"]
+        col_null_counts[col] = stats["null_count"]
+
+        if stats["missing_flagged"] is not None:
+            results["columns_with_missing"].append(stats["missing_flagged"])
+
+        if stats["is_constant"]:
             results["has_constant_columns"] = True
             results["constant_columns"].append(col)
             results["quality_score"] -= 10
-    
-    # 2. Check for high cardinality categorical columns
-    categorical_dtypes = ['object', 'category', 'string']
-    categorical_cols = df.select_dtypes(include=categorical_dtypes).columns
-    
-    for col in categorical_cols:
-        unique_count = int(df[col].nunique())
-        if unique_count > high_cardinality_threshold:
+
+        if stats["high_cardinality"] is not None:
             results["has_high_cardinality"] = True
             results["high_cardinality_cols"].append(col)
-            results["high_cardinality_details"].append({
-                "column": col,
-                "unique_count": unique_count,
-                "threshold": int(high_cardinality_threshold)
-            })
+            results["high_cardinality_details"].append(stats["high_cardinality"])
             results["quality_score"] -= 5
-    
-    # 3. Check for ID duplicates
-    id_cols = [col for col in df.columns if 'id' in col.lower()]
-    for col in id_cols:
-        duplicates = df[col].duplicated()
-        if bool(duplicates.any()):
+
+        if stats["imbalanced"] is not None:
+            results["has_imbalanced_categories"] = True
+            results["imbalanced_columns"].append(stats["imbalanced"])
+            results["quality_score"] -= 6
+
+        if stats["id_duplicate_count"] is not None and stats["id_duplicate_count"] > 0:
             results["has_id_duplicates"] = True
             results["duplicate_id_info"][col] = {
-                "duplicate_count": int(duplicates.sum()),
-                "total": int(len(df[col]))
+                "duplicate_count": stats["id_duplicate_count"],
+                "total": n
             }
             results["quality_score"] -= 15
-    
-    # 4. Check for many zero values
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        zero_count = int((df[col] == 0).sum())
-        zero_ratio = float(zero_count / len(df)) if len(df) > 0 else 0.0
-        if zero_ratio > zero_threshold:
-            results["has_many_zeros"] = True
-            results["zero_columns"].append({
-                "column": col,
-                "zero_ratio": float(zero_ratio),
-                "threshold": float(zero_threshold)
-            })
-            results["quality_score"] -= 8
-    
-    # 5. Check for missing values
-    for col in df.columns:
-        missing_count = int(df[col].isnull().sum())
-        missing_ratio = float(missing_count / len(df)) if len(df) > 0 else 0.0
-        if missing_ratio > min_missing_share:
-            results["columns_with_missing"].append({
-                "column": col,
-                "missing_ratio": float(missing_ratio),
-                "threshold": float(min_missing_share)
-            })
-    
+
+    numeric_col_list = [col for col in df.columns if col in numeric_cols]
+
     # ============================================
-    # НОВАЯ ЭВРИСТИКА 1: Обнаружение выбросов (IQR метод)
+    # Много нулевых значений в числовых колонках
     # ============================================
-    for col in numeric_cols:
-        if len(df[col].dropna()) < 10:  # нужно минимум 10 значений
-            continue
-            
-        q1 = df[col].quantile(0.25)
-        q3 = df[col].quantile(0.75)
-        iqr = q3 - q1
-        
-        if iqr > 0:  # избегаем деления на ноль
-            lower_bound = q1 - outlier_threshold * iqr
-            upper_bound = q3 + outlier_threshold * iqr
-            
-            outliers = ((df[col] < lower_bound) | (df[col] > upper_bound))
-            outliers_count = outliers.sum()
-            outliers_ratio = outliers_count / len(df[col])
-            
-            if outliers_ratio > 0.05:  # если больше 5% выбросов
-                results["has_outliers"] = True
-                results["outlier_columns"].append({
+    # Один непрерывный скан числового блока вместо сравнения по колонке
+    if numeric_col_list and n > 0:
+        # count_nonzero редуцирует bool-маску popcount-ом,
+        # без промежуточного каста bool -> int64
+        zero_counts = np.count_nonzero(
+            df[numeric_col_list].to_numpy(copy=False) == 0, axis=0
+        )
+        for col, zero_count in zip(numeric_col_list, zero_counts):
+            zero_ratio = float(zero_count / n)
+            if zero_ratio > zero_threshold:
+                results["has_many_zeros"] = True
+                results["zero_columns"].append({
                     "column": col,
-                    "outliers_count": int(outliers_count),
-                    "outliers_ratio": float(outliers_ratio),
-                    "lower_bound": float(lower_bound),
-                    "upper_bound": float(upper_bound)
+                    "zero_ratio": float(zero_ratio),
+                    "threshold": float(zero_threshold)
                 })
-                results["quality_score"] -= 7
-    
+                results["quality_score"] -= 8
+
     # ============================================
-    # НОВАЯ ЭВРИСТИКА 2: Несбалансированные категории
+    # Обнаружение выбросов (IQR метод)
     # ============================================
-    for col in categorical_cols:
-        value_counts = df[col].value_counts(normalize=True)
-        if len(value_counts) > 1:  # не проверяем константные колонки
-            dominant_ratio = value_counts.iloc[0]  # доля самой частой категории
-            
-            if dominant_ratio > imbalance_threshold:
-                results["has_imbalanced_categories"] = True
-                results["imbalanced_columns"].append({
-                    "column": col,
-                    "dominant_category": value_counts.index[0],
-                    "dominant_ratio": float(dominant_ratio),
-                    "threshold": float(imbalance_threshold),
-                    "unique_categories": int(len(value_counts))
-                })
-                results["quality_score"] -= 6
-    
-    # Calculate counts
-    results["missing_count"] = int(df.isnull().sum().sum())
+    # Оба квантиля для всех числовых колонок считаются одним вызовом
+    # df.quantile вместо двух отдельных .quantile() на колонку
+    # Блок целиком пропускается для фреймов без числовых колонок
+    if numeric_col_list and n > 0:
+        numeric_df = df[numeric_col_list]
+        quantiles = numeric_df.quantile([0.25, 0.75])
+        q1 = quantiles.loc[0.25]
+        q3 = quantiles.loc[0.75]
+        iqr = q3 - q1
+        lower_bounds = q1 - outlier_threshold * iqr
+        upper_bounds = q3 + outlier_threshold * iqr
+        # Счётчики выбросов по всем колонкам одной C-level редукцией
+        outlier_counts = (
+            numeric_df.lt(lower_bounds, axis=1) | numeric_df.gt(upper_bounds, axis=1)
+        ).sum(axis=0)
+
+        for col in numeric_col_list:
+            # non-null счётчик уже накоплен в однопроходном скане выше,
+            # отдельный dropna()-проход не нужен
+            if n - col_null_counts[col] < 10:  # нужно минимум 10 значений
+                continue
+
+            if iqr[col] > 0:  # избегаем деления на ноль
+                outliers_count = int(outlier_counts[col])
+                outliers_ratio = outliers_count / n
+
+                if outliers_ratio > 0.05:  # если больше 5% выбросов
+                    results["has_outliers"] = True
+                    results["outlier_columns"].append({
+                        "column": col,
+                        "outliers_count": int(outliers_count),
+                        "outliers_ratio": float(outliers_ratio),
+                        "lower_bound": float(lower_bounds[col]),
+                        "upper_bound": float(upper_bounds[col])
+                    })
+                    results["quality_score"] -= 7
+
+    # Calculate counts (missing уже накоплен в одном проходе выше)
+    results["missing_count"] = int(total_missing)
     results["duplicate_count"] = int(df.duplicated().sum())
     
     # Ensure boolean values are Python bool
@@ -196,6 +341,7 @@ def compute_quality_flags(
     
     # Limit quality score
     results["quality_score"] = int(max(0, min(100, results["quality_score"])))
-    
-    # Convert all numpy types to Python types
-    return ensure_python_types(results)
+
+    # Все значения уже построены как Python-скаляры в проходах выше,
+    # рекурсивная конвертация типов не нужна
+    return results
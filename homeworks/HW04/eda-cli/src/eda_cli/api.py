@@ -1,21 +1,196 @@
 
+import asyncio
+import hashlib
 import json
+import os
 import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+import numpy as np
 import pandas as pd
 from fastapi import FastAPI, File, UploadFile, HTTPException, Query
 from fastapi.responses import JSONResponse
 
+try:
+    import orjson
+except ImportError:  # orjson опционален - остаёмся на stdlib json
+    orjson = None
+
+if orjson is not None:
+    class _NumpyJSONResponse(JSONResponse):
+        """orjson-сериализация с нативной поддержкой numpy-скаляров.
+
+        OPT_SERIALIZE_NUMPY позволяет отдавать np.int64/np.float64/np.bool_
+        прямо из pandas-агрегатов, без int()/float()/bool() на каждом поле.
+        """
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(
+                content,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+
+    _default_response_class = _NumpyJSONResponse
+else:
+    _default_response_class = JSONResponse
+
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow опционален - остаёмся на pandas-парсере
+    pacsv = None
+
+try:
+    import polars as pl
+except ImportError:  # polars опционален - остаёмся на Arrow/pandas
+    pl = None
+
 
 from .core import load_data, compute_quality_flags, compute_basic_stats
 
 
+def _missing_count(df: pd.DataFrame) -> int:
+    """Count missing cells column by column.
+
+    df.isnull().sum().sum() материализует bool-маску размером со весь фрейм
+    плюс промежуточный Series; поколоночная редукция по numpy-массивам
+    считает то же без большой 2-D аллокации.
+    """
+    return int(sum(df[col].isna().to_numpy().sum() for col in df.columns))
+
+
+# Ниже этого размера (в ячейках) точный df.duplicated() достаточно дёшев
+_HASH_DUP_MIN_CELLS = 100_000
+
+
+def _duplicate_count(df: pd.DataFrame) -> int:
+    """Count duplicated rows.
+
+    Для больших фреймов строки сворачиваются в uint64-хэши через
+    pd.util.hash_pandas_object, и дубликаты считаются одним векторным
+    np.unique по 8-байтовым значениям - без построчных сравнений
+    df.duplicated() по всем колонкам.
+    """
+    if df.shape[0] * df.shape[1] <= _HASH_DUP_MIN_CELLS:
+        return int(df.duplicated().sum())
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return int(len(hashes) - np.unique(hashes).size)
+
+
+# NA-спеллинги парсера pandas: Arrow/polars по умолчанию не считают
+# пустые строки и "NA"/"NaN" пропусками в строковых колонках, из-за чего
+# missing_count зависел бы от установленного парсера
+_CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+
+def _csv_metrics(source) -> tuple:
+    """Parse a CSV and return (n_rows, n_cols, missing_count, duplicate_count).
+
+    Синхронная CPU-bound часть /quality-from-csv; вызывается из
+    worker-потока через asyncio.to_thread. source - путь или бинарный
+    file-like объект. Фрейм наружу не уходит - читаем CSV стриминговым
+    Arrow-reader-ом батчами: в памяти живёт один батч, а не весь фрейм.
+    """
+    if pl is not None:
+        try:
+            # Ленивый план Polars: длина, null-счётчики и дубликаты
+            # (len - уникальные строки) сливаются в один скомпилированный
+            # многопоточный проход без промежуточных материализаций.
+            # null_values выравнивает NA-спеллинги с pandas-фоллбеком -
+            # метрики не должны зависеть от установленного парсера
+            lf = pl.scan_csv(source, null_values=_CSV_NA_VALUES)
+            n_cols = len(lf.collect_schema())
+            stats = lf.select(
+                pl.len().alias("n_rows"),
+                pl.sum_horizontal(pl.all().null_count()).alias("nulls"),
+                (pl.len() - pl.struct(pl.all()).n_unique()).alias("dups"),
+            ).collect()
+            return (
+                int(stats["n_rows"][0]),
+                n_cols,
+                int(stats["nulls"][0]),
+                int(stats["dups"][0]),
+            )
+        except Exception:
+            # нечитаемый для polars источник - откат на Arrow/pandas
+            if hasattr(source, "seek"):
+                source.seek(0)
+
+    if pacsv is not None:
+        n_rows = 0
+        missing_count = 0
+        batch_hashes = []
+        # strings_can_be_null + список NA-спеллингов pandas: иначе пустые
+        # поля и "NA" в строковых колонках не считались бы пропусками
+        convert_options = pacsv.ConvertOptions(
+            null_values=_CSV_NA_VALUES, strings_can_be_null=True
+        )
+        with pacsv.open_csv(source, convert_options=convert_options) as reader:
+            n_cols = len(reader.schema)
+            for batch in reader:
+                n_rows += batch.num_rows
+                # null_count уже посчитан парсером - O(n_cols) на батч
+                missing_count += sum(col.null_count for col in batch.columns)
+                # построчные uint64-хэши батча для подсчёта дубликатов
+                batch_hashes.append(
+                    pd.util.hash_pandas_object(
+                        batch.to_pandas(), index=False
+                    ).to_numpy()
+                )
+        missing_count = int(missing_count)
+        if batch_hashes:
+            hashes = np.concatenate(batch_hashes)
+            duplicate_count = int(len(hashes) - np.unique(hashes).size)
+        else:
+            duplicate_count = 0
+        return n_rows, n_cols, missing_count, duplicate_count
+
+    df = pd.read_csv(source)
+    n_rows, n_cols = df.shape
+    return n_rows, n_cols, _missing_count(df), _duplicate_count(df)
+
+
+# Максимальный размер аплоада: защита от патологических аллокаций
+# (многогигабайтный CSV иначе целиком пройдёт через парсер).
+# Настраивается переменной окружения
+MAX_UPLOAD_BYTES = int(os.environ.get("EDA_API_MAX_UPLOAD_BYTES", 100 * 1024 * 1024))
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Return the upload size in bytes.
+
+    file.size берётся из multipart-заголовков, если клиент его прислал;
+    иначе размер меряется по спулу без чтения содержимого.
+    """
+    if file.size is not None:
+        return file.size
+    spool = file.file
+    pos = spool.tell()
+    spool.seek(0, 2)
+    size = spool.tell()
+    spool.seek(pos)
+    return size
+
+
+# Кэш ответов /quality-flags-from-csv по хэшу содержимого аплоада:
+# повторная загрузка того же файла (итерации в UI, тесты) пропускает
+# парсинг и все сканы. Мелкие файлы дешевле пересчитать, чем кэшировать
+_response_cache: Dict[tuple, Dict[str, Any]] = {}
+_RESPONSE_CACHE_MAX = 32
+_CACHE_MIN_BYTES = 10 * 1024
+
+
 app = FastAPI(
     title="EDA API",
     description="HTTP API для анализа качества данных",
-    version="0.2.0"
+    version="0.2.0",
+    # orjson сериализует ответ на C-уровне в разы быстрее stdlib json
+    # и понимает numpy-скаляры напрямую
+    default_response_class=_default_response_class,
 )
 
 
@@ -34,23 +209,25 @@ def compute_quality(
 ) -> Dict[str, Any]:
     
     # Эвристики из семинара
-    too_few_rows = bool(n_rows < 100)
-    too_many_missing = bool(missing_ratio > 0.3)
-    too_many_duplicates = bool(duplicate_ratio > 0.1)
-    
-    # Интегральный показатель качества (0-100)
-    quality_score = 100
-    if too_few_rows:
-        quality_score -= 20
-    if too_many_missing:
-        quality_score -= min(int(missing_ratio * 100), 40)
-    if too_many_duplicates:
-        quality_score -= min(int(duplicate_ratio * 100), 30)
-    
-    ok_for_model = bool(quality_score >= 70)
+    too_few_rows = n_rows < 100
+    too_many_missing = missing_ratio > 0.3
+    too_many_duplicates = duplicate_ratio > 0.1
     
+    # Интегральный показатель качества (0-100): безветвенная форма -
+    # штрафы умножаются на bool-флаги вместо трёх if-ов
+    quality_score = (
+        100
+        - 20 * too_few_rows
+        - min(int(missing_ratio * 100), 40) * too_many_missing
+        - min(int(duplicate_ratio * 100), 30) * too_many_duplicates
+    )
+
+    ok_for_model = quality_score >= 70
+
+    # Параметры уже приведены к нативным типам FastAPI/Query, а score -
+    # целочисленная арифметика: повторные int()/float() не нужны
     return {
-        "quality_score": int(quality_score),
+        "quality_score": quality_score,
         "ok_for_model": ok_for_model,
         "flags": {
             "too_few_rows": too_few_rows,
@@ -58,10 +235,10 @@ def compute_quality(
             "too_many_duplicates": too_many_duplicates,
         },
         "metadata": {
-            "n_rows": int(n_rows),
-            "n_cols": int(n_cols),
-            "missing_ratio": float(missing_ratio),
-            "duplicate_ratio": float(duplicate_ratio),
+            "n_rows": n_rows,
+            "n_cols": n_cols,
+            "missing_ratio": missing_ratio,
+            "duplicate_ratio": duplicate_ratio,
         }
     }
 
@@ -80,42 +257,126 @@ async def compute_quality_from_csv(
             status_code=400,
             detail="Поддерживаются только CSV файлы"
         )
-    
+
+    if _upload_size(file) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Файл больше лимита {MAX_UPLOAD_BYTES} байт"
+        )
+
     try:
-        # Сохраняем файл во временную директорию
-        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # Загружаем данные
-        df = pd.read_csv(tmp_path)
-        
-        # Вычисляем метрики с явным преобразованием типов
-        n_rows, n_cols = df.shape
-        missing_count = int(df.isnull().sum().sum())
-        duplicate_count = int(df.duplicated().sum())
-        
-        missing_ratio = float(missing_count / (n_rows * n_cols)) if n_rows * n_cols > 0 else 0.0
-        duplicate_ratio = float(duplicate_count / n_rows) if n_rows > 0 else 0.0
-        
+        # Без tempfile: UploadFile.file - это SpooledTemporaryFile со всем
+        # содержимым аплоада (мелкие файлы в памяти, крупные Starlette сам
+        # сбрасывает на диск), парсер читает его напрямую - без лишнего
+        # цикла записи/чтения через файловую систему.
+        # Парсинг и счётчики - CPU-bound: уводим в worker-поток, чтобы
+        # не блокировать event loop и не сериализовать конкурентные аплоады
+        await file.seek(0)
+        n_rows, n_cols, missing_count, duplicate_count = \
+            await asyncio.to_thread(_csv_metrics, file.file)
+
+        # n_rows * n_cols считается один раз; счётчики из _csv_metrics
+        # уже нативные int, деление даёт нативный float - без перекастов
+        total = n_rows * n_cols
+        missing_ratio = missing_count / total if total else 0.0
+        duplicate_ratio = duplicate_count / n_rows if n_rows else 0.0
+
         # Вызываем существующий эндпоинт
         return compute_quality(
-            n_rows=int(n_rows),
-            n_cols=int(n_cols),
-            missing_ratio=float(missing_ratio),
-            duplicate_ratio=float(duplicate_ratio)
+            n_rows=n_rows,
+            n_cols=n_cols,
+            missing_ratio=missing_ratio,
+            duplicate_ratio=duplicate_ratio
         )
-        
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Ошибка при обработке файла: {str(e)}"
         )
-    finally:
-        # Удаляем временный файл
-        if 'tmp_path' in locals():
-            Path(tmp_path).unlink(missing_ok=True)
+
+
+def _analyze_csv_flags(
+    tmp_path: str,
+    high_cardinality_threshold: int,
+    zero_threshold: float,
+    min_missing_share: float,
+    flags_only: bool,
+) -> Dict[str, Any]:
+    """Parse a CSV and build the full quality-flags response.
+
+    Синхронная CPU-bound часть /quality-flags-from-csv; вызывается из
+    worker-потока через asyncio.to_thread.
+    """
+    # Загружаем данные используя нашу функцию из HW03.
+    # Sidecar-кэш выключен: tmp_path уникален для каждого запроса,
+    # попадания невозможны, а sidecar-ы копили бы каждый аплоад на диске
+    df = load_data(tmp_path, use_cache=False)
+
+    # Вычисляем базовые метрики
+    n_rows, n_cols = df.shape
+    missing_count = _missing_count(df)
+    duplicate_count = _duplicate_count(df)
+
+    # n_rows * n_cols считается один раз, деление даёт нативный float
+    total = n_rows * n_cols
+    missing_ratio = missing_count / total if total else 0.0
+    duplicate_ratio = duplicate_count / n_rows if n_rows else 0.0
+
+    # Эвристики из семинара
+    too_few_rows = n_rows < 100
+    too_many_missing = missing_ratio > 0.3
+    too_many_duplicates = duplicate_ratio > 0.1
+
+    # ВЫПОЛНЕНИЕ HW04: Используем наши эвристики из HW03
+    quality_info = compute_quality_flags(
+        df,
+        high_cardinality_threshold=high_cardinality_threshold,
+        zero_threshold=zero_threshold,
+        min_missing_share=min_missing_share,
+        flags_only=flags_only
+    )
+
+    # Формируем полный ответ с флагами из HW03
+    return {
+        "quality_score": quality_info.get("quality_score", 100),
+        "ok_for_model": quality_info.get("quality_score", 100) >= 70,
+        "flags": {
+            # Флаги из семинара
+            "too_few_rows": too_few_rows,
+            "too_many_missing": too_many_missing,
+            "too_many_duplicates": too_many_duplicates,
+
+            # НОВЫЕ ФЛАГИ ИЗ HW03:
+            "has_constant_columns": quality_info.get("has_constant_columns", False),
+            "has_high_cardinality_categoricals": quality_info.get("has_high_cardinality", False),
+            "has_suspicious_id_duplicates": quality_info.get("has_id_duplicates", False),
+            "has_many_zero_values": quality_info.get("has_many_zeros", False),
+        },
+        "details": {
+            # Детали по новым эвристикам
+            "constant_columns": quality_info.get("constant_columns", []),
+            "high_cardinality_columns": quality_info.get("high_cardinality_cols", []),
+            "high_cardinality_details": quality_info.get("high_cardinality_details", []),
+            "duplicate_id_info": quality_info.get("duplicate_id_info", {}),
+            "zero_columns": quality_info.get("zero_columns", []),
+            "columns_with_missing": quality_info.get("columns_with_missing", []),
+        },
+        "metadata": {
+            # счётчики и пороги уже нативные int/float - без перекастов
+            "n_rows": n_rows,
+            "n_cols": n_cols,
+            "missing_ratio": missing_ratio,
+            "duplicate_ratio": duplicate_ratio,
+            "missing_count": missing_count,
+            "duplicate_count": duplicate_count,
+            "parameters": {
+                "high_cardinality_threshold": high_cardinality_threshold,
+                "zero_threshold": zero_threshold,
+                "min_missing_share": min_missing_share,
+            }
+        }
+    }
 
 
 @app.post("/quality-flags-from-csv")
@@ -124,6 +385,7 @@ async def compute_quality_flags_from_csv(
     high_cardinality_threshold: int = Query(50, description="Порог для высококардинальных категориальных признаков"),
     zero_threshold: float = Query(0.3, description="Порог для нулевых значений в числовых колонках"),
     min_missing_share: float = Query(0.1, description="Минимальная доля пропусков для флагирования колонки"),
+    flags_only: bool = Query(False, description="Считать только булевы флаги с ранними выходами, без списков деталей"),
 ) -> Dict[str, Any]:
     
     if not file.filename.endswith('.csv'):
@@ -131,89 +393,81 @@ async def compute_quality_flags_from_csv(
             status_code=400,
             detail="Поддерживаются только CSV файлы"
         )
-    
+
+    # Ранний отказ по заявленному размеру, до записи чего-либо на диск
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Файл больше лимита {MAX_UPLOAD_BYTES} байт"
+        )
+
     try:
-        # Сохраняем файл во временную директорию
-        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # Загружаем данные используя нашу функцию из HW03
-        df = load_data(tmp_path)
-        
-        # Вычисляем базовые метрики
-        n_rows, n_cols = df.shape
-        missing_count = int(df.isnull().sum().sum())
-        duplicate_count = int(df.duplicated().sum())
-        
-        missing_ratio = float(missing_count / (n_rows * n_cols)) if n_rows * n_cols > 0 else 0.0
-        duplicate_ratio = float(duplicate_count / n_rows) if n_rows > 0 else 0.0
-        
-        # Эвристики из семинара
-        too_few_rows = bool(n_rows < 100)
-        too_many_missing = bool(missing_ratio > 0.3)
-        too_many_duplicates = bool(duplicate_ratio > 0.1)
-        
-        # ВЫПОЛНЕНИЕ HW04: Используем наши эвристики из HW03
-        quality_info = compute_quality_flags(
-            df,
-            high_cardinality_threshold=high_cardinality_threshold,
-            zero_threshold=zero_threshold,
-            min_missing_share=min_missing_share
+        # Стримим файл во временную директорию чанками: в памяти держится
+        # не весь аплоад, а один чанк. Хэш содержимого считается по тем же
+        # чанкам - отдельного прохода по файлу не нужно.
+        # Создание tempfile и запись чанков - блокирующие syscalls:
+        # уводим их в worker-поток, чтобы event loop не простаивал
+        # на медленном диске
+        hasher = hashlib.blake2b(digest_size=16)
+        total_bytes = 0
+        tmp = await asyncio.to_thread(
+            tempfile.NamedTemporaryFile, suffix='.csv', delete=False
         )
-        
-        # Формируем полный ответ с флагами из HW03
-        response = {
-            "quality_score": quality_info.get("quality_score", 100),
-            "ok_for_model": bool(quality_info.get("quality_score", 100) >= 70),
-            "flags": {
-                # Флаги из семинара
-                "too_few_rows": too_few_rows,
-                "too_many_missing": too_many_missing,
-                "too_many_duplicates": too_many_duplicates,
-                
-                # НОВЫЕ ФЛАГИ ИЗ HW03:
-                "has_constant_columns": bool(quality_info.get("has_constant_columns", False)),
-                "has_high_cardinality_categoricals": bool(quality_info.get("has_high_cardinality", False)),
-                "has_suspicious_id_duplicates": bool(quality_info.get("has_id_duplicates", False)),
-                "has_many_zero_values": bool(quality_info.get("has_many_zeros", False)),
-            },
-            "details": {
-                # Детали по новым эвристикам
-                "constant_columns": quality_info.get("constant_columns", []),
-                "high_cardinality_columns": quality_info.get("high_cardinality_cols", []),
-                "high_cardinality_details": quality_info.get("high_cardinality_details", []),
-                "duplicate_id_info": quality_info.get("duplicate_id_info", {}),
-                "zero_columns": quality_info.get("zero_columns", []),
-                "columns_with_missing": quality_info.get("columns_with_missing", []),
-            },
-            "metadata": {
-                "n_rows": int(n_rows),
-                "n_cols": int(n_cols),
-                "missing_ratio": float(missing_ratio),
-                "duplicate_ratio": float(duplicate_ratio),
-                "missing_count": int(missing_count),
-                "duplicate_count": int(duplicate_count),
-                "parameters": {
-                    "high_cardinality_threshold": int(high_cardinality_threshold),
-                    "zero_threshold": float(zero_threshold),
-                    "min_missing_share": float(min_missing_share),
-                }
-            }
-        }
-        
+        tmp_path = tmp.name
+        try:
+            while chunk := await file.read(1 << 20):
+                hasher.update(chunk)
+                total_bytes += len(chunk)
+                # Страховка от занижения Content-Length: обрываем поток,
+                # как только фактический размер превысил лимит
+                if total_bytes > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Файл больше лимита {MAX_UPLOAD_BYTES} байт"
+                    )
+                await asyncio.to_thread(tmp.write, chunk)
+        finally:
+            await asyncio.to_thread(tmp.close)
+
+        cache_key = (
+            hasher.hexdigest(),
+            high_cardinality_threshold, zero_threshold,
+            min_missing_share, flags_only,
+        )
+        if total_bytes > _CACHE_MIN_BYTES:
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+
+        # Парсинг и эвристики - CPU-bound: уводим в worker-поток, чтобы
+        # не блокировать event loop и не сериализовать конкурентные аплоады
+        response = await asyncio.to_thread(
+            _analyze_csv_flags,
+            tmp_path,
+            high_cardinality_threshold,
+            zero_threshold,
+            min_missing_share,
+            flags_only,
+        )
+
+        if total_bytes > _CACHE_MIN_BYTES:
+            if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+                _response_cache.pop(next(iter(_response_cache)))
+            _response_cache[cache_key] = dict(response)
+
         return response
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Ошибка при обработке файла: {str(e)}"
         )
     finally:
-        # Удаляем временный файл
+        # Удаляем временный файл; unlink - тоже блокирующий syscall
         if 'tmp_path' in locals():
-            Path(tmp_path).unlink(missing_ok=True)
+            await asyncio.to_thread(Path(tmp_path).unlink, missing_ok=True)
 
 
 @app.get("/")
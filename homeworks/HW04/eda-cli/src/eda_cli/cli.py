@@ -4,7 +4,11 @@ from pathlib import Path
 import sys
 import os
 
-from eda_cli.core import load_data, compute_basic_stats, compute_quality_flags
+from eda_cli.core import (
+    load_data,
+    compute_basic_stats,
+    compute_quality_flags_for_file,
+)
 
 @click.group()
 def cli():
@@ -18,8 +22,11 @@ def overview(csv_file):
     try:
         df = load_data(csv_file)
         stats = compute_basic_stats(df)
-        quality = compute_quality_flags(df)
-        
+        # overview показывает только флаги, точный счётчик дубликатов
+        # не нужен - включаем проверку с ранним выходом; результат
+        # мемоизируется на диске по (файл, mtime, размер)
+        quality = compute_quality_flags_for_file(csv_file, fast_duplicates=True)
+
         click.echo("Dataset Overview")
         click.echo(f"Rows: {stats['rows']}")
         click.echo(f"Columns: {stats['columns']}")
@@ -57,8 +64,8 @@ def report(csv_file, out_dir, title, max_hist_columns, top_k_categories,
     try:
         df = load_data(csv_file)
         stats = compute_basic_stats(df)
-        quality = compute_quality_flags(
-            df, 
+        quality = compute_quality_flags_for_file(
+            csv_file,
             high_cardinality_threshold=high_cardinality_threshold,
             zero_threshold=zero_threshold
         )
@@ -68,52 +75,56 @@ def report(csv_file, out_dir, title, max_hist_columns, top_k_categories,
         
         # Генерируем отчет
         report_path = Path(out_dir) / "report.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {title}\n\n")
-            f.write(f"## Dataset Statistics\n")
-            f.write(f"- Rows: {stats['rows']}\n")
-            f.write(f"- Columns: {stats['columns']}\n\n")
-            
-            f.write(f"## Data Quality Assessment\n")
-            f.write(f"- Overall quality check:\n")
-            f.write(f"  - Has missing values: {quality['has_missing']}\n")
-            f.write(f"  - Missing count: {quality['missing_count']}\n")
-            f.write(f"  - Has duplicates: {quality['has_duplicates']}\n")
-            f.write(f"  - Duplicate count: {quality['duplicate_count']}\n\n")
-            
-            # Новые эвристики из HW03
-            f.write(f"## New Quality Heuristics (HW03)\n")
-            
-            if quality['has_constant_columns']:
-                f.write(f"-  **Constant columns detected**: {', '.join(quality['constant_columns'])}\n")
-            else:
-                f.write(f"- ✓ No constant columns found\n")
-            
-            if quality['has_high_cardinality']:
-                f.write(f"- **High cardinality columns** (> {quality.get('high_cardinality_threshold', 50)} unique values): {', '.join(quality['high_cardinality_cols'])}\n")
-            else:
-                f.write(f"- ✓ No high cardinality categorical columns\n")
-            
-            # Проверка дубликатов ID (если есть)
-            if 'has_id_duplicates' in quality and quality['has_id_duplicates']:
-                f.write(f"- **ID duplicates found**:\n")
-                for col, count in quality.get('duplicate_id_info', {}).items():
-                    f.write(f"  - {col}: {count} duplicates\n")
-            
-            # Проверка нулевых значений (если есть в core.py)
-            if 'has_many_zeros' in quality and quality['has_many_zeros']:
-                f.write(f"-  **Many zero values detected** (> {quality.get('zero_threshold', 0.3):.0%}):\n")
-                for col, ratio in quality.get('zero_columns', []):
-                    f.write(f"  - {col}: {ratio:.1%} zeros\n")
-            
-            f.write(f"\n## Report Generation Parameters\n")
-            f.write(f"- Max histograms to generate: {max_hist_columns}\n")
-            f.write(f"- Top categories to show: {top_k_categories}\n")
-            f.write(f"- Missing values threshold: {min_missing_share:.0%}\n")
-            f.write(f"- High cardinality threshold: {high_cardinality_threshold}\n")
-            f.write(f"- Zero values threshold: {zero_threshold:.0%}\n")
-            f.write(f"- Report generated with: eda-cli v0.1.0\n")
-        
+        # Отчёт собирается в буфере и пишется на диск одним вызовом,
+        # без построчных f.write с блокировками/флашами
+        buf = []
+        buf.append(f"# {title}\n\n")
+        buf.append(f"## Dataset Statistics\n")
+        buf.append(f"- Rows: {stats['rows']}\n")
+        buf.append(f"- Columns: {stats['columns']}\n\n")
+
+        buf.append(f"## Data Quality Assessment\n")
+        buf.append(f"- Overall quality check:\n")
+        buf.append(f"  - Has missing values: {quality['has_missing']}\n")
+        buf.append(f"  - Missing count: {quality['missing_count']}\n")
+        buf.append(f"  - Has duplicates: {quality['has_duplicates']}\n")
+        buf.append(f"  - Duplicate count: {quality['duplicate_count']}\n\n")
+
+        # Новые эвристики из HW03
+        buf.append(f"## New Quality Heuristics (HW03)\n")
+
+        if quality['has_constant_columns']:
+            buf.append(f"-  **Constant columns detected**: {', '.join(quality['constant_columns'])}\n")
+        else:
+            buf.append(f"- ✓ No constant columns found\n")
+
+        if quality['has_high_cardinality']:
+            buf.append(f"- **High cardinality columns** (> {quality.get('high_cardinality_threshold', 50)} unique values): {', '.join(quality['high_cardinality_cols'])}\n")
+        else:
+            buf.append(f"- ✓ No high cardinality categorical columns\n")
+
+        # Проверка дубликатов ID (если есть)
+        if 'has_id_duplicates' in quality and quality['has_id_duplicates']:
+            buf.append(f"- **ID duplicates found**:\n")
+            for col, count in quality.get('duplicate_id_info', {}).items():
+                buf.append(f"  - {col}: {count} duplicates\n")
+
+        # Проверка нулевых значений (если есть в core.py)
+        if 'has_many_zeros' in quality and quality['has_many_zeros']:
+            buf.append(f"-  **Many zero values detected** (> {quality.get('zero_threshold', 0.3):.0%}):\n")
+            for col, ratio in quality.get('zero_columns', []):
+                buf.append(f"  - {col}: {ratio:.1%} zeros\n")
+
+        buf.append(f"\n## Report Generation Parameters\n")
+        buf.append(f"- Max histograms to generate: {max_hist_columns}\n")
+        buf.append(f"- Top categories to show: {top_k_categories}\n")
+        buf.append(f"- Missing values threshold: {min_missing_share:.0%}\n")
+        buf.append(f"- High cardinality threshold: {high_cardinality_threshold}\n")
+        buf.append(f"- Zero values threshold: {zero_threshold:.0%}\n")
+        buf.append(f"- Report generated with: eda-cli v0.1.0\n")
+
+        report_path.write_text("".join(buf), encoding='utf-8')
+
         click.echo(f"Report generated: {report_path}")
         
     except Exception as e:
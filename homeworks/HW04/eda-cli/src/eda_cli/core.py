@@ -1,10 +1,132 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Tuple
 
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load CSV file."""
-    return pd.read_csv(filepath)
+try:
+    from numba import njit
+except ImportError:  # numba опционален - остаёмся на пандасовых проходах
+    njit = None
+
+# Ниже этого размера (в ячейках) три отдельных прохода дешевле JIT-прогрева
+_FUSED_SCAN_MIN_CELLS = 100_000
+
+if njit is not None:
+    @njit(cache=True)
+    def _fused_scan_kernel(arr, bits):
+        """Single fused pass over a float64 frame.
+
+        За один проход по строкам собирает то, что иначе требует трёх
+        сканов фрейма: null-счётчики по колонкам, FNV-хэш каждой строки
+        (для подсчёта дубликатов) и флаги константных колонок. Трафик
+        памяти падает с 3x размера фрейма до 1x.
+        """
+        n, m = arr.shape
+        null_counts = np.zeros(m, np.int64)
+        row_hashes = np.empty(n, np.uint64)
+        first_val = np.empty(m, np.float64)
+        has_val = np.zeros(m, np.bool_)
+        diff_seen = np.zeros(m, np.bool_)
+        NAN_BITS = np.uint64(0x7FF8000000000000)
+        FNV_OFFSET = np.uint64(14695981039346656037)
+        FNV_PRIME = np.uint64(1099511628211)
+        for i in range(n):
+            h = FNV_OFFSET
+            for j in range(m):
+                v = arr[i, j]
+                if v != v:
+                    null_counts[j] += 1
+                    b = NAN_BITS  # канонизируем NaN-биты для хэша
+                else:
+                    b = bits[i, j]
+                    if not has_val[j]:
+                        has_val[j] = True
+                        first_val[j] = v
+                    elif v != first_val[j]:
+                        diff_seen[j] = True
+                h = (h ^ b) * FNV_PRIME
+            row_hashes[i] = h
+        # Константа как в _is_constant: все non-null значения равны первому
+        # non-null; NaN игнорируются, полностью пустая колонка - не константа
+        is_const = np.empty(m, np.bool_)
+        for j in range(m):
+            is_const[j] = has_val[j] and not diff_seen[j]
+        return null_counts, row_hashes, is_const
+
+def _fused_scan(df: pd.DataFrame):
+    """Run the fused kernel if the frame qualifies, else return None.
+
+    Срабатывает только на достаточно больших полностью float64-фреймах:
+    там один слитый проход заменяет isnull-, duplicated- и constant-сканы.
+    """
+    if njit is None or df.size < _FUSED_SCAN_MIN_CELLS:
+        return None
+    if not all(str(dtype) == 'float64' for dtype in df.dtypes):
+        return None
+    arr = np.ascontiguousarray(df.to_numpy(copy=False))
+    return _fused_scan_kernel(arr, arr.view(np.uint64))
+
+# Ограничение числа feather-sidecar-ов: старейшие вытесняются по mtime
+_SIDECAR_CACHE_MAX = 16
+
+
+def load_data(filepath: str, use_cache: bool = True) -> pd.DataFrame:
+    """Load CSV file, caching the parsed frame in a feather sidecar.
+
+    Повторная загрузка того же файла (типичный сценарий overview -> report)
+    читает колоночный sidecar вместо повторного парсинга CSV. Ключ кэша
+    включает mtime и размер, так что изменённый файл перечитывается заново.
+    Sidecar-ы живут в пользовательском ~/.cache/eda_cli (не в общем
+    tempdir) и вытесняются по mtime, чтобы кэш не рос бесконечно.
+    use_cache=False отключает sidecar для одноразовых файлов (API пишет
+    каждый аплоад в уникальный tempfile - попадание в кэш невозможно).
+    """
+    if use_cache:
+        path = Path(filepath)
+        stat = path.stat()
+        key = hashlib.blake2b(
+            f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode()
+        ).hexdigest()[:16]
+        cache_dir = Path.home() / ".cache" / "eda_cli"
+        cache_path = cache_dir / f"sidecar_{key}.feather"
+        if cache_path.exists():
+            try:
+                return pd.read_feather(cache_path)
+            except Exception:
+                pass  # повреждённый sidecar - перечитываем CSV
+    try:
+        # Многопоточный парсер Arrow; numpy-бэкенд типов сохраняем,
+        # чтобы эвристики по dtype вели себя как раньше
+        df = pd.read_csv(filepath, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(filepath)
+    # Низкокардинальные строковые колонки переводим в category:
+    # дальнейшие nunique/value_counts работают по упакованным кодам,
+    # а не по Python-объектам
+    n_rows = len(df)
+    for col in df.select_dtypes(include="object").columns:
+        if df[col].nunique(dropna=False) / max(n_rows, 1) < 0.5:
+            df[col] = df[col].astype("category")
+    if use_cache:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            df.reset_index(drop=True).to_feather(cache_path)
+            sidecars = sorted(
+                cache_dir.glob("sidecar_*.feather"),
+                key=lambda p: p.stat().st_mtime,
+            )
+            for old in sidecars[:-_SIDECAR_CACHE_MAX]:
+                old.unlink(missing_ok=True)
+        except Exception:
+            pass  # нет pyarrow или несериализуемые колонки - работаем без кэша
+    return df
 
 def compute_basic_stats(df: pd.DataFrame) -> dict:
     """Compute basic statistics."""
@@ -14,58 +136,339 @@ def compute_basic_stats(df: pd.DataFrame) -> dict:
         "dtypes": df.dtypes.to_dict(),
     }
 
+def exceeds_cardinality(series: pd.Series, threshold: int, chunk_size: int = 65536) -> Tuple[bool, Any]:
+    """Check whether a column has more than `threshold` unique values.
+
+    Scans the column in chunks and stops as soon as the running set of
+    distinct values exceeds the threshold, so very high-cardinality columns
+    (IDs, emails) are detected after reading only the first chunk.
+    Returns (True, None) on early exit, otherwise (False, exact_unique_count).
+    """
+    values = series.dropna().to_numpy()
+    if len(values) == 0:
+        return False, 0
+    seen = set()
+    for chunk in np.array_split(values, max(1, len(values) // chunk_size)):
+        seen.update(chunk.tolist())
+        if len(seen) > threshold:
+            return True, None
+    return False, len(seen)
+
+def _is_constant(series: pd.Series) -> bool:
+    """Check whether all non-null values of a column are identical.
+
+    Одно SIMD-сравнение с первым non-null элементом вместо хэширующего
+    nunique: np.any по bool-маске выходит на C-уровне без словаря
+    уникальных. Семантика та же, что у nunique() == 1: NaN игнорируются,
+    полностью пустая колонка константой не считается.
+    """
+    arr = series.to_numpy()
+    non_null = arr[~pd.isna(arr)]
+    if non_null.size == 0:
+        return False
+    return not bool((non_null != non_null[0]).any())
+
+def _column_flag_scan(series: pd.Series, is_object: bool, threshold: int) -> Tuple[bool, Any, bool]:
+    """Per-column scan returning (cardinality_exceeded, exact_count, is_constant).
+
+    Вызывается из пула потоков: numpy/pandas-редукции внутри отпускают
+    GIL, поэтому колонки сканируются с реальным параллелизмом по ядрам.
+    """
+    if is_object:
+        exceeded, exact = exceeds_cardinality(series, threshold)
+        return exceeded, exact, exact == 1
+    return False, None, _is_constant(series)
+
+def any_duplicated_fast(df: pd.DataFrame, chunk_size: int = 200_000) -> bool:
+    """Check whether the frame contains at least one duplicated row.
+
+    Хэширует строки чанками через pd.util.hash_pandas_object и возвращает
+    True при первом повторе, не дочитывая фрейм до конца - в отличие от
+    df.duplicated(), который всегда хэширует все строки.
+    """
+    seen = set()
+    for start in range(0, len(df), chunk_size):
+        keys = pd.util.hash_pandas_object(
+            df.iloc[start:start + chunk_size], index=False
+        ).to_numpy()
+        for key in keys:
+            if key in seen:
+                return True
+            seen.add(key)
+    return False
+
+def _df_key(df: pd.DataFrame) -> tuple:
+    """Stable fingerprint of a DataFrame for memoization.
+
+    pd.util.hash_pandas_object хэширует значения векторизованно на C-уровне;
+    shape, имена колонок и dtypes добавлены в ключ: результат зависит от
+    имён (constant_columns, эвристика 'id' в имени), а коллизии по
+    значениям не должны склеивать разные по структуре фреймы.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return (
+        hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest(),
+        df.shape,
+        tuple(df.columns),
+        tuple(df.dtypes.astype(str)),
+    )
+
+_flags_cache: Dict[tuple, dict] = {}
+_flags_cache_lock = threading.Lock()
+_FLAGS_CACHE_MAX = 32
+
 def compute_quality_flags(df: pd.DataFrame, **kwargs) -> dict:
-    """Compute data quality flags."""
+    """Compute data quality flags, memoizing by DataFrame fingerprint.
+
+    Повторный вызов на том же фрейме (overview -> report в ноутбуке или
+    тестах) возвращает закэшированный результат: ключ строится из
+    хэша значений, shape, dtypes и параметров. Кэш ограничен по размеру,
+    вытесняется самая старая запись.
+    """
+    try:
+        key = (_df_key(df), tuple(sorted(kwargs.items())))
+    except TypeError:
+        # нехэшируемая колонка или параметр - считаем без кэша
+        return _compute_quality_flags(df, **kwargs)
+    # API зовёт нас из пула потоков (asyncio.to_thread): доступ к кэшу
+    # под локом, иначе две конкурентные вставки гоняются за вытеснением
+    # одного и того же старейшего ключа
+    with _flags_cache_lock:
+        cached = _flags_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+    quality = _compute_quality_flags(df, **kwargs)
+    with _flags_cache_lock:
+        if len(_flags_cache) >= _FLAGS_CACHE_MAX:
+            _flags_cache.pop(next(iter(_flags_cache)), None)
+        # Глубокая копия: shallow dict() делит вложенные списки с вызывающим
+        # кодом, и мутация результата отравила бы кэш
+        _flags_cache[key] = copy.deepcopy(quality)
+    return quality
+
+def _quality_flags_only(df: pd.DataFrame, **kwargs) -> dict:
+    """Compute boolean quality flags with early exits, skipping details.
+
+    Каждая эвристика останавливается на первой сработавшей колонке,
+    списки деталей не строятся. quality_score в этом режиме использует
+    фиксированный штраф за флаг (без поколоночных множителей), так как
+    полные списки проблемных колонок не вычисляются.
+    """
+    n = len(df)
+    total_null = int(df.isnull().sum(axis=0).sum())
+    n_cells = n * df.shape[1]
+    high_card_threshold = kwargs.get('high_cardinality_threshold', 50)
+    zero_threshold = kwargs.get('zero_threshold', 0.3)
+    object_cols = set(df.select_dtypes(include=['object', 'category']).columns)
+
+    # Кардинальность: выходим на первой колонке свыше порога;
+    # точные счётчики недорогих колонок переиспользуются ниже
+    has_high_card = False
+    card_exact = {}
+    for col in df.columns:
+        if col not in object_cols:
+            continue
+        exceeded, exact = exceeds_cardinality(df[col], high_card_threshold)
+        card_exact[col] = exact
+        if exceeded:
+            has_high_card = True
+            break
+
+    # Константность: выходим на первой константной колонке
+    has_constant = False
+    for col in df.columns:
+        if col in object_cols:
+            uniq = card_exact[col] if col in card_exact else \
+                exceeds_cardinality(df[col], high_card_threshold)[1]
+            if uniq == 1:
+                has_constant = True
+                break
+        elif _is_constant(df[col]):
+            has_constant = True
+            break
+
+    # Дубликаты в ID колонках: выходим на первой колонке с повторами
+    has_id_dups = False
+    for col in df.columns:
+        if ('id' in col.lower() or 'ID' in col) and int(df[col].nunique(dropna=False)) < n:
+            has_id_dups = True
+            break
+
+    # Нулевые значения: выходим на первой колонке свыше порога
+    has_many_zeros = False
+    if n > 0:
+        for col in df.select_dtypes(include=[np.number]).columns:
+            if np.count_nonzero(df[col].to_numpy(copy=False) == 0) / n > zero_threshold:
+                has_many_zeros = True
+                break
+
+    quality = {
+        "has_missing": total_null > 0,
+        "missing_count": total_null,
+        "missing_ratio": total_null / n_cells if n_cells else 0,
+        "has_duplicates": any_duplicated_fast(df),
+        "has_constant_columns": has_constant,
+        "constant_columns": [],
+        "has_high_cardinality": has_high_card,
+        "high_cardinality_cols": [],
+        "high_cardinality_details": [],
+        "high_cardinality_threshold": high_card_threshold,
+        "has_id_duplicates": has_id_dups,
+        "duplicate_id_info": {},
+        "has_many_zeros": has_many_zeros,
+        "zero_columns": [],
+        "zero_threshold": zero_threshold,
+    }
+
+    quality_score = 100
+    if quality["has_missing"]:
+        quality_score -= min(quality["missing_ratio"] * 100, 30)
+    if quality["has_duplicates"]:
+        quality_score -= 15
+    if has_constant:
+        quality_score -= 10
+    if has_high_card:
+        quality_score -= 5
+    if has_id_dups:
+        quality_score -= 15
+    if has_many_zeros:
+        quality_score -= 10
+    quality["quality_score"] = max(0, min(100, round(quality_score, 1)))
+
+    return quality
+
+def _compute_quality_flags(df: pd.DataFrame, **kwargs) -> dict:
+    """Compute data quality flags.
+
+    С fast_duplicates=True проверка дубликатов завершается на первом
+    найденном повторе (путь overview); duplicate_count/duplicate_ratio
+    в этом режиме не вычисляются и в результат не попадают.
+
+    С flags_only=True считаются только булевы флаги с ранними выходами,
+    списки деталей возвращаются пустыми.
+    """
+    if kwargs.get('flags_only', False):
+        return _quality_flags_only(df, **kwargs)
+
     # Базовые проверки
+    # На больших полностью числовых фреймах один слитый numba-проход
+    # даёт сразу null-счётчики, хэши строк и константные флаги
+    fused = _fused_scan(df)
+    if fused is not None:
+        fused_nulls, fused_hashes, fused_const = fused
+        col_null = pd.Series(fused_nulls, index=df.columns)
+        unique_rows = int(np.unique(fused_hashes).size)
+    else:
+        # Маска пропусков материализуется один раз: per-column счётчики и
+        # общий итог выводятся из неё без повторных df.isnull()
+        col_null = df.isnull().sum(axis=0)
+        unique_rows = None
+    total_null = int(col_null.sum())
+    n_cells = df.shape[0] * df.shape[1]
+
+    # Хэширование строк для duplicated() - самый дорогой агрегат здесь.
+    # Для overview хватает булевого флага с ранним выходом, точный
+    # счётчик нужен только пути report
+    if kwargs.get('fast_duplicates', False):
+        dup_count = None
+        if unique_rows is not None:
+            has_duplicates = unique_rows < len(df)
+        else:
+            has_duplicates = any_duplicated_fast(df)
+    else:
+        if unique_rows is not None:
+            dup_count = len(df) - unique_rows
+        else:
+            dup_count = int(df.duplicated().sum())
+        has_duplicates = dup_count > 0
+
     quality = {
-        "has_missing": df.isnull().any().any(),
-        "missing_count": df.isnull().sum().sum(),
-        "missing_ratio": df.isnull().sum().sum() / (df.shape[0] * df.shape[1]),
-        "has_duplicates": df.duplicated().any(),
-        "duplicate_count": df.duplicated().sum(),
-        "duplicate_ratio": df.duplicated().sum() / df.shape[0] if df.shape[0] > 0 else 0,
+        "has_missing": total_null > 0,
+        "missing_count": total_null,
+        "missing_ratio": total_null / n_cells if n_cells else 0,
+        "has_duplicates": has_duplicates,
     }
+    if dup_count is not None:
+        quality["duplicate_count"] = dup_count
+        quality["duplicate_ratio"] = dup_count / df.shape[0] if df.shape[0] > 0 else 0
     
     # HW03: Новые эвристики
     
+    high_card_threshold = kwargs.get('high_cardinality_threshold', 50)
+
+    # Для строковых/категориальных колонок кардинальность проверяем с ранним
+    # выходом: сканируем чанками и останавливаемся, как только порог превышен.
+    # category добавлен, т.к. load_data теперь конвертирует строки в category
+    object_cols = set(df.select_dtypes(include=['object', 'category']).columns)
+
+    if fused is not None:
+        # Слитый проход уже дал константные флаги; object-колонок
+        # в полностью числовом фрейме нет
+        col_scans = {
+            col: (False, None, bool(flag))
+            for col, flag in zip(df.columns, fused_const)
+        }
+    else:
+        # Пер-колоночные сканы (зонд кардинальности + константность)
+        # независимы: на широких фреймах раскладываем их по пулу потоков,
+        # executor.map сохраняет порядок колонок
+        tasks = [
+            (df[col], col in object_cols, high_card_threshold)
+            for col in df.columns
+        ]
+        if len(tasks) > 4:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                scans = list(executor.map(lambda args: _column_flag_scan(*args), tasks))
+        else:
+            scans = [_column_flag_scan(*args) for args in tasks]
+        col_scans = dict(zip(df.columns, scans))
+
     # 1. Константные колонки (все значения одинаковые)
-    constant_cols = []
-    for col in df.columns:
-        if df[col].nunique() == 1:
-            constant_cols.append(col)
+    # Для object-колонок константность видна из зонда кардинальности,
+    # для остальных - SIMD-сравнение с первым элементом вместо
+    # хэширующего nunique по всему фрейму
+    constant_cols = [col for col in df.columns if col_scans[col][2]]
     quality["has_constant_columns"] = len(constant_cols) > 0
     quality["constant_columns"] = constant_cols
-    
-    # 2. Высококардинальные категориальные признаки
-    high_card_threshold = kwargs.get('high_cardinality_threshold', 50)
-    high_card_cols = []
-    for col in df.select_dtypes(include=['object']).columns:
-        unique_count = df[col].nunique()
-        if unique_count > high_card_threshold:
-            high_card_cols.append((col, unique_count))
+
+    # 2. Высококардинальные категориальные признаки - по результатам зонда
+    high_card_names = [col for col in df.columns if col_scans[col][0]]
+    # точный счётчик нужен только для флагнутых колонок
+    high_card_cols = [(col, int(df[col].nunique())) for col in high_card_names]
     quality["has_high_cardinality"] = len(high_card_cols) > 0
-    quality["high_cardinality_cols"] = [col for col, _ in high_card_cols]
+    quality["high_cardinality_cols"] = high_card_names
     quality["high_cardinality_details"] = high_card_cols
     quality["high_cardinality_threshold"] = high_card_threshold
-    
+
     # 3. Дубликаты в ID колонках
+    # Количество дубликатов = len(df) - nunique; nunique хэшируется
+    # только для id-колонок, где нужен точный счётчик
     id_cols = [col for col in df.columns if 'id' in col.lower() or 'ID' in col]
     duplicate_id_info = {}
     for col in id_cols:
-        duplicate_count = df[col].duplicated().sum()
+        unique_count = int(df[col].nunique(dropna=False))
+        duplicate_count = len(df) - unique_count
         if duplicate_count > 0:
             duplicate_id_info[col] = duplicate_count
     quality["has_id_duplicates"] = len(duplicate_id_info) > 0
     quality["duplicate_id_info"] = duplicate_id_info
     
     # 4. Много нулевых значений в числовых колонках
+    # Один непрерывный скан числового блока вместо цикла по колонкам
     zero_threshold = kwargs.get('zero_threshold', 0.3)
     zero_cols = []
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        zero_ratio = (df[col] == 0).sum() / len(df)
-        if zero_ratio > zero_threshold:
-            zero_cols.append((col, zero_ratio))
+    if len(numeric_cols) > 0 and len(df) > 0:
+        # count_nonzero редуцирует bool-маску popcount-ом,
+        # без промежуточного каста bool -> int64
+        zero_ratios = np.count_nonzero(
+            df[numeric_cols].to_numpy(copy=False) == 0, axis=0
+        ) / len(df)
+        zero_cols = [
+            (col, float(ratio))
+            for col, ratio in zip(numeric_cols, zero_ratios)
+            if ratio > zero_threshold
+        ]
     quality["has_many_zeros"] = len(zero_cols) > 0
     quality["zero_columns"] = zero_cols
     quality["zero_threshold"] = zero_threshold
@@ -77,7 +480,7 @@ def compute_quality_flags(df: pd.DataFrame, **kwargs) -> dict:
     if quality["has_missing"]:
         quality_score -= min(quality["missing_ratio"] * 100, 30)
     
-    if quality["has_duplicates"]:
+    if quality["has_duplicates"] and "duplicate_ratio" in quality:
         quality_score -= min(quality["duplicate_ratio"] * 50, 20)
     
     if quality["has_constant_columns"]:
@@ -94,5 +497,33 @@ def compute_quality_flags(df: pd.DataFrame, **kwargs) -> dict:
             quality_score -= min(ratio * 20, 10)
     
     quality["quality_score"] = max(0, min(100, round(quality_score, 1)))
-    
+
+    return quality
+
+def compute_quality_flags_for_file(filepath: str, **kwargs) -> dict:
+    """Compute quality flags for a CSV file, memoizing the result on disk.
+
+    Результат кэшируется как JSON в ~/.cache/eda_cli с ключом по
+    (путь, mtime, размер, параметры): повторный запуск той же команды на
+    неизменённом файле пропускает работу pandas целиком. Изменение файла
+    меняет mtime/размер и инвалидирует запись.
+    """
+    path = Path(filepath)
+    stat = path.stat()
+    key = hashlib.blake2b(
+        f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{sorted(kwargs.items())}".encode()
+    ).hexdigest()[:16]
+    cache_dir = Path.home() / ".cache" / "eda_cli"
+    cache_file = cache_dir / f"flags_{key}.json"
+    if cache_file.exists():
+        try:
+            return json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass  # повреждённая запись - пересчитываем
+    quality = compute_quality_flags(load_data(filepath), **kwargs)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(quality), encoding="utf-8")
+    except (OSError, TypeError):
+        pass  # кэш недоступен или результат несериализуем - работаем без него
     return quality
@@ -0,0 +1,95 @@
+"""Smoke-тесты HTTP API через TestClient, без реального сервера."""
+
+from fastapi.testclient import TestClient
+
+from eda_cli.api import app
+
+client = TestClient(app)
+
+
+def test_health():
+    """Test health endpoint."""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_quality_from_metrics():
+    """Test quality endpoint with explicit metrics."""
+    response = client.post(
+        "/quality",
+        params={"n_rows": 1000, "n_cols": 5, "missing_ratio": 0.0},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["quality_score"] == 100
+    assert data["ok_for_model"] is True
+
+
+def test_quality_from_csv():
+    """Test CSV upload endpoint."""
+    csv_content = "a,b\n1,2\n3,4\n"
+    response = client.post(
+        "/quality-from-csv",
+        files={"file": ("test.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["n_rows"] == 2
+    assert data["metadata"]["n_cols"] == 2
+
+
+def test_quality_from_csv_rejects_non_csv():
+    """Test rejection of non-CSV uploads."""
+    response = client.post(
+        "/quality-from-csv",
+        files={"file": ("test.txt", "not a csv", "text/plain")},
+    )
+    assert response.status_code == 400
+
+
+def test_quality_flags_from_csv():
+    """Test full quality-flags endpoint."""
+    csv_content = "user_id,constant,value\n1,5,10\n2,5,20\n1,5,30\n"
+    response = client.post(
+        "/quality-flags-from-csv",
+        files={"file": ("test.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["flags"]["has_constant_columns"] is True
+    assert data["flags"]["has_suspicious_id_duplicates"] is True
+    assert "constant" in data["details"]["constant_columns"]
+
+
+def test_upload_size_limit(monkeypatch):
+    """Test 413 on uploads over the configured size limit."""
+    from eda_cli import api
+
+    monkeypatch.setattr(api, "MAX_UPLOAD_BYTES", 10)
+    csv_content = "a,b\n" + "1,2\n" * 10
+    response = client.post(
+        "/quality-from-csv",
+        files={"file": ("test.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 413
+    response = client.post(
+        "/quality-flags-from-csv",
+        files={"file": ("test.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 413
+
+
+def test_quality_flags_from_csv_flags_only():
+    """Test flags-only mode returns flags without detail lists."""
+    csv_content = "user_id,constant,value\n1,5,10\n2,5,20\n1,5,30\n"
+    response = client.post(
+        "/quality-flags-from-csv",
+        params={"flags_only": "true"},
+        files={"file": ("test.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["flags"]["has_constant_columns"] is True
+    assert data["flags"]["has_suspicious_id_duplicates"] is True
+    assert data["details"]["constant_columns"] == []
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from eda_cli.core import load_data, compute_quality_flags
+from eda_cli.core import load_data, compute_quality_flags, exceeds_cardinality
 
 def test_load_data(tmp_path):
     """Test loading data."""
@@ -74,6 +74,18 @@ def test_quality_flags_zero_values():
     quality = compute_quality_flags(df, zero_threshold=0.8)
     assert quality['has_many_zeros'] == False
 
+def test_exceeds_cardinality():
+    """Test early-exit cardinality check."""
+    low = pd.Series(['a', 'b', 'c'] * 10)
+    exceeded, exact = exceeds_cardinality(low, 5)
+    assert exceeded == False
+    assert exact == 3
+
+    high = pd.Series([f'user_{i}' for i in range(100)])
+    exceeded, exact = exceeds_cardinality(high, 50)
+    assert exceeded == True
+    assert exact is None
+
 def test_quality_score():
     """Test quality score calculation."""
     df = pd.DataFrame({